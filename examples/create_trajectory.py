@@ -9,12 +9,18 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.data_loader import load_match_data, get_tracking_dataframe, get_possession_info
+# Headless batch rendering: select Agg before pyplot is imported
+import matplotlib
+
+matplotlib.use("Agg")
+
+from src.data_loader import load_match_data, get_team_player_ids
 from src.utils import calculate_velocity
 from src.space_analysis import analyze_offball_runs, group_runs_to_trajectories
 from src.visualization import draw_pitch, plot_run_trajectories
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
+import numpy as np
 import pandas as pd
 
 # Configuration
@@ -89,15 +95,11 @@ def create_trajectory_plot(
 
 # Load data
 data = load_match_data(MATCH_ID)
-poss_df = get_possession_info(data["tracking"])
+tracking_by_period = data["tracking_by_period"]
+poss_df = data["possession_df"]
 
 # Get team info
-home_ids = list(
-    poss_df[poss_df["group"] == "home team"]["player_id"].dropna().astype(int).unique()
-)
-away_ids = list(
-    poss_df[poss_df["group"] == "away team"]["player_id"].dropna().astype(int).unique()
-)
+home_ids, away_ids = get_team_player_ids(poss_df)
 home_name = data["metadata"]["home_team"]["name"]
 away_name = data["metadata"]["away_team"]["name"]
 match_info = f"{home_name} {data['metadata']['home_team_score']} - {data['metadata']['away_team_score']} {away_name}"
@@ -109,31 +111,28 @@ selected_color = "blue" if TEAM == "home" else "red"
 # Process both periods
 all_traj = []
 for period in [1, 2]:
-    df = get_tracking_dataframe(data["tracking"], period=period)
-    if len(df) == 0:
+    df = tracking_by_period.get(period)
+    if df is None or len(df) == 0:
         continue
 
     df_vel = calculate_velocity(df)
     runs = analyze_offball_runs(
         df_vel, poss_df, home_ids, away_ids, velocity_threshold=VELOCITY_THRESHOLD
     )
-    runs = runs.merge(
-        df_vel[["frame", "player_id", "x", "y"]], on=["frame", "player_id"]
-    )
     traj = group_runs_to_trajectories(runs)
 
     if len(traj) > 0:
         # Normalize attack direction
         home_team_side = data["metadata"].get("home_team_side", [])
         if len(home_team_side) > period - 1:
-            if home_team_side[period - 1] == "right_to_left":
-                traj.loc[
-                    traj["team"] == "home", ["start_x", "end_x", "start_y", "end_y"]
-                ] *= -1
-            else:
-                traj.loc[
-                    traj["team"] == "away", ["start_x", "end_x", "start_y", "end_y"]
-                ] *= -1
+            flip_team = (
+                "home" if home_team_side[period - 1] == "right_to_left" else "away"
+            )
+            sign = np.where(traj["team"].to_numpy() == flip_team, -1, 1).astype(
+                np.float32
+            )
+            for col in ["start_x", "end_x", "start_y", "end_y"]:
+                traj[col] = traj[col].to_numpy() * sign
         all_traj.append(traj)
 
 # Combine and filter selected team
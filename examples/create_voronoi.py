@@ -9,13 +9,12 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.data_loader import (
-    load_match_data,
-    get_tracking_dataframe,
-    get_possession_info,
-    get_ball_dataframe,
-)
-from src.utils import calculate_velocity
+# Headless batch rendering: select Agg before pyplot is imported
+import matplotlib
+
+matplotlib.use("Agg")
+
+from src.data_loader import load_match_data, get_team_player_ids
 from src.visualization import draw_pitch, plot_players, plot_voronoi
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
@@ -28,27 +27,31 @@ PERIOD = 1
 
 # Load data
 data = load_match_data(MATCH_ID)
-df_vel = calculate_velocity(get_tracking_dataframe(data["tracking"], period=PERIOD))
-poss_df = get_possession_info(data["tracking"])
-ball_df = get_ball_dataframe(data["tracking"], period=PERIOD)
+poss_df = data["possession_df"]
+
+# Only one frame is drawn: slice it out once (velocities are not needed)
+tracking = data["tracking_by_period"][PERIOD]
+frame_df = tracking[tracking["frame"] == FRAME]
+ball_df = data["ball_df"]
 
 # Get team IDs
-home_ids = list(
-    poss_df[poss_df["group"] == "home team"]["player_id"].dropna().astype(int).unique()
-)
-away_ids = list(
-    poss_df[poss_df["group"] == "away team"]["player_id"].dropna().astype(int).unique()
-)
+home_ids, away_ids = get_team_player_ids(poss_df)
+
+# Mirror and draw the cells on this match's pitch, as the analysis does
+pitch_length = data["metadata"].get("pitch_length") or 105
+pitch_width = data["metadata"].get("pitch_width") or 68
 
 # Get frame metadata
-timestamp = df_vel[df_vel["frame"] == FRAME].iloc[0]["timestamp"]
+timestamp = frame_df.iloc[0]["timestamp"]
 minutes, seconds = int(timestamp.split(":")[1]), int(float(timestamp.split(":")[2]))
 
 # Create visualization
 fig, ax = plt.subplots(figsize=(14, 10))
-draw_pitch(ax)
-plot_voronoi(ax, df_vel, FRAME, alpha=0.2)
-plot_players(ax, df_vel, FRAME, home_ids, away_ids)
+draw_pitch(ax, pitch_length, pitch_width)
+plot_voronoi(
+    ax, frame_df, FRAME, alpha=0.2, pitch_length=pitch_length, pitch_width=pitch_width
+)
+plot_players(ax, frame_df, FRAME, home_ids, away_ids)
 
 # Ball
 ball_pos = ball_df[ball_df["frame"] == FRAME].iloc[0]
@@ -64,7 +67,7 @@ ax.scatter(
 
 # Ball carrier
 bc_id = poss_df[poss_df["frame"] == FRAME].iloc[0]["player_id"]
-bc_pos = df_vel[(df_vel["frame"] == FRAME) & (df_vel["player_id"] == bc_id)].iloc[0]
+bc_pos = frame_df[frame_df["player_id"] == bc_id].iloc[0]
 ax.scatter(
     bc_pos["x"],
     bc_pos["y"],
@@ -1,9 +1,19 @@
+import numpy as np
 import pandas as pd
 import json
+import os
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 import tempfile
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Temporary cache directory
 DATA_DIR = Path(tempfile.gettempdir()) / "analytics_cup_cache"
 DATA_DIR.mkdir(exist_ok=True)
@@ -11,6 +21,16 @@ DATA_DIR.mkdir(exist_ok=True)
 # GitHub Base URL
 BASE_URL = "https://raw.githubusercontent.com/SkillCorner/opendata/master/data"
 
+# Shared HTTP session: reuses TCP/TLS connections across files and matches.
+# Created per process, so forked workers never share the parent's sockets
+_SESSION = None
+_SESSION_PID = None
+
+# Flattened tracking tables cached as {match_id}_{name}_v{version}.parquet;
+# bump the version whenever the table columns or dtypes change
+TRACKING_TABLES = ("tracking", "ball", "possession")
+TRACKING_CACHE_VERSION = 1
+
 
 def load_matches_info(match_ids=None):
     """
@@ -27,50 +47,192 @@ def load_matches_info(match_ids=None):
     return [{"id": str(match_id)} for match_id in match_ids]
 
 
-def load_match_data(match_id, verbose=False):
+def _session():
+    """HTTP session of the current process."""
+    global _SESSION, _SESSION_PID
+    if _SESSION is None or _SESSION_PID != os.getpid():
+        _SESSION = requests.Session()
+        _SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+        _SESSION_PID = os.getpid()
+    return _SESSION
+
+
+def _partial_path(path):
+    """Temporary sibling of `path`, unique per process, to write then rename."""
+    return path.with_name(f"{path.name}.{os.getpid()}.part")
+
+
+def _write_text(path, text):
+    """Write a text file atomically (readers never see a partial file)."""
+    partial = _partial_path(path)
+    partial.write_text(text, encoding="utf-8")
+    partial.replace(path)
+
+
+def _download_file(url, path, chunk_size=1 << 20):
+    """Stream a (large) file to disk without buffering the whole response."""
+    partial = _partial_path(path)
+    with _session().get(url, stream=True) as response:
+        response.raise_for_status()
+        with open(partial, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+    partial.replace(path)
+
+
+def _write_parquet_cache(frames, paths):
+    """Persist flattened tracking tables; skipped if no Parquet engine is installed."""
+    # Write every table to a .part file first so an interrupted run never
+    # leaves a truncated table under its final name
+    partials = {name: _partial_path(path) for name, path in paths.items()}
+    try:
+        for name, df in frames.items():
+            df.to_parquet(partials[name], compression="zstd", index=False)
+    except ImportError:
+        for partial in partials.values():
+            partial.unlink(missing_ok=True)
+        return
+
+    for name, partial in partials.items():
+        partial.replace(paths[name])
+
+
+def load_match_metadata(match_id):
     """
-    Load match data from SkillCorner API with local caching.
+    Load match metadata (teams, players, pitch sides) with local caching.
 
     Args:
         match_id (str): Match identifier
-        verbose (bool): Print download progress
 
     Returns:
-        dict: Contains 'metadata', 'tracking', 'events', 'phases'
+        dict: Parsed match JSON
     """
     match_id = str(match_id)
 
-    # Metadata
     meta_file = DATA_DIR / f"{match_id}_meta.json"
     if not meta_file.exists():
         url = f"{BASE_URL}/matches/{match_id}/{match_id}_match.json"
-        response = requests.get(url)
+        response = _session().get(url)
         response.raise_for_status()
-        meta_file.write_text(response.text, encoding="utf-8")
+        _write_text(meta_file, response.text)
 
-    metadata = json.loads(meta_file.read_text(encoding="utf-8"))
+    return _json_loads(meta_file.read_bytes())
 
-    # Tracking (Git LFS)
-    track_file = DATA_DIR / f"{match_id}_tracking.jsonl"
-    if not track_file.exists():
-        url = f"https://media.githubusercontent.com/media/SkillCorner/opendata/master/data/matches/{match_id}/{match_id}_tracking_extrapolated.jsonl"
-        response = requests.get(url)
-        response.raise_for_status()
-        track_file.write_bytes(response.content)
 
-    tracking = [
-        json.loads(line)
-        for line in track_file.read_text(encoding="utf-8").strip().split("\n")
-        if line
-    ]
+def load_players(match_ids):
+    """
+    Player names and teams for the given matches, cached in players.parquet.
+
+    Only matches missing from the cache have their metadata loaded.
+
+    Args:
+        match_ids (list): Match identifiers
+
+    Returns:
+        pd.DataFrame: Columns: match_id, player_id, name, team
+    """
+    match_ids = [str(match_id) for match_id in match_ids]
+    players_file = DATA_DIR / "players.parquet"
+
+    if players_file.exists():
+        players = pd.read_parquet(players_file)
+    else:
+        players = pd.DataFrame(columns=["match_id", "player_id", "name", "team"])
+    cached = set(players["match_id"])
+
+    rows = []
+    for match_id in dict.fromkeys(match_ids):
+        if match_id in cached:
+            continue
+
+        metadata = load_match_metadata(match_id)
+        home_team, away_team = metadata["home_team"], metadata["away_team"]
+        for p in metadata["players"]:
+            rows.append(
+                {
+                    "match_id": match_id,
+                    "player_id": p["id"],
+                    "name": f"{p.get('first_name', '')} {p.get('last_name', '')}".strip(),
+                    "team": (
+                        home_team["name"]
+                        if p["team_id"] == home_team["id"]
+                        else away_team["name"]
+                    ),
+                }
+            )
+
+    if rows:
+        new_players = pd.DataFrame(rows)
+        players = (
+            pd.concat([players, new_players], ignore_index=True)
+            if len(players)
+            else new_players
+        )
+        # Write beside the cache and rename, so a killed run never leaves a
+        # truncated players.parquet behind
+        partial = _partial_path(players_file)
+        try:
+            players.to_parquet(partial, index=False)
+        except ImportError:
+            partial.unlink(missing_ok=True)
+        else:
+            partial.replace(players_file)
+
+    return players[players["match_id"].isin(match_ids)].reset_index(drop=True)
+
+
+def load_match_data(match_id, verbose=False):
+    """
+    Load match data from SkillCorner API with local caching.
+
+    Args:
+        match_id (str): Match identifier
+        verbose (bool): Print download progress
+
+    Returns:
+        dict: Contains 'metadata', 'tracking_df', 'ball_df', 'possession_df',
+            'events', 'phases', plus 'tracking_by_period' ({period: tracking
+            rows}). The flattened tracking DataFrames are cached as Parquet
+            after the first parse of the raw JSONL.
+    """
+    match_id = str(match_id)
+
+    metadata = load_match_metadata(match_id)
+
+    # Tracking: flattened Parquet cache, else parse raw JSONL (Git LFS)
+    frames_files = {
+        name: DATA_DIR / f"{match_id}_{name}_v{TRACKING_CACHE_VERSION}.parquet"
+        for name in TRACKING_TABLES
+    }
+    if all(path.exists() for path in frames_files.values()):
+        frames = {name: pd.read_parquet(path) for name, path in frames_files.items()}
+    else:
+        track_file = DATA_DIR / f"{match_id}_tracking.jsonl"
+        if not track_file.exists():
+            url = f"https://media.githubusercontent.com/media/SkillCorner/opendata/master/data/matches/{match_id}/{match_id}_tracking_extrapolated.jsonl"
+            _download_file(url, track_file)
+
+        # Iterate the file lazily instead of materializing it and its lines
+        with open(track_file, "rb") as f:
+            tracking = [_json_loads(line) for line in f if line.strip()]
+
+        # Warm-up/half-time frames carry no period; drop them once
+        tracking = [frame for frame in tracking if frame.get("period") is not None]
+
+        frames = {
+            "tracking": get_tracking_dataframe(tracking),
+            "ball": get_ball_dataframe(tracking),
+            "possession": get_possession_info(tracking),
+        }
+        _write_parquet_cache(frames, frames_files)
 
     # Events
     events_file = DATA_DIR / f"{match_id}_events.csv"
     if not events_file.exists():
         url = f"{BASE_URL}/matches/{match_id}/{match_id}_dynamic_events.csv"
-        response = requests.get(url)
+        response = _session().get(url)
         response.raise_for_status()
-        events_file.write_text(response.text, encoding="utf-8")
+        _write_text(events_file, response.text)
 
     events = pd.read_csv(events_file, low_memory=False)
 
@@ -78,63 +240,123 @@ def load_match_data(match_id, verbose=False):
     phases_file = DATA_DIR / f"{match_id}_phases.csv"
     if not phases_file.exists():
         url = f"{BASE_URL}/matches/{match_id}/{match_id}_phases_of_play.csv"
-        response = requests.get(url)
+        response = _session().get(url)
         response.raise_for_status()
-        phases_file.write_text(response.text, encoding="utf-8")
+        _write_text(phases_file, response.text)
 
     phases = pd.read_csv(phases_file, low_memory=False)
 
     if verbose:
         print(
-            f"Loaded match {match_id}: {len(tracking):,} frames, {len(events):,} events, {len(phases):,} phases"
+            f"Loaded match {match_id}: {frames['tracking']['frame'].nunique():,} frames, {len(events):,} events, {len(phases):,} phases"
         )
 
     return {
         "metadata": metadata,
-        "tracking": tracking,
+        "tracking_df": frames["tracking"],
+        "tracking_by_period": split_by_period(frames["tracking"]),
+        "ball_df": frames["ball"],
+        "possession_df": frames["possession"],
         "events": events,
         "phases": phases,
     }
 
 
-def get_tracking_dataframe(tracking_data, period=None):
+def split_by_period(df):
     """
-    Convert nested tracking data to flat DataFrame.
+    Split a frame-ordered DataFrame into per-period row slices.
+
+    Periods are contiguous in chronological tracking data, so each period is
+    a zero-copy positional slice instead of a boolean mask per access.
 
     Args:
-        tracking_data (list): Frame dicts from load_match_data()
-        period (int, optional): Filter by period (1 or 2)
+        df (pd.DataFrame): Flattened data with a 'period' column
 
     Returns:
-        pd.DataFrame: Columns: frame, timestamp, period, player_id, x, y, is_detected
+        dict: {period: pd.DataFrame}
     """
-    rows = []
+    periods = df["period"].to_numpy()
+    if len(periods) == 0:
+        return {}
+
+    if not (np.diff(periods) >= 0).all():
+        return {period: group for period, group in df.groupby("period")}
+
+    bounds = np.flatnonzero(np.diff(periods)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(df)]))
+    return {int(periods[start]): df.iloc[start:end] for start, end in zip(starts, ends)}
+
+
+def _select_frames(tracking_data, period=None):
+    """Frames with a valid period, optionally restricted to a single period."""
+    return [
+        frame_data
+        for frame_data in tracking_data
+        if frame_data.get("period") is not None
+        and (period is None or frame_data["period"] == period)
+    ]
 
-    for frame_data in tracking_data:
-        if frame_data.get("period") is None:
-            continue
 
-        if period is not None and frame_data["period"] != period:
-            continue
+def get_tracking_dataframe(tracking_data, period=None, include_is_detected=False):
+    """
+    Convert nested tracking data to flat DataFrame.
 
-        frame_info = {
-            "frame": frame_data["frame"],
-            "timestamp": frame_data["timestamp"],
-            "period": frame_data["period"],
-        }
+    Frame/period/player_id are int32, x/y float32 and timestamp categorical
+    (one category per frame) to keep long matches compact.
 
-        for player in frame_data.get("player_data", []):
-            rows.append(
-                {
-                    **frame_info,
-                    "player_id": player["player_id"],
-                    "x": player["x"],
-                    "y": player["y"],
-                    "is_detected": player["is_detected"],
-                }
-            )
+    Args:
+        tracking_data (list): Parsed frame dicts (one per line of the raw
+            tracking JSONL)
+        period (int, optional): Filter by period (1 or 2)
+        include_is_detected (bool): Also emit the boolean 'is_detected' column
+
+    Returns:
+        pd.DataFrame: Columns: frame, timestamp, period, player_id, x, y
+            (+ is_detected)
+    """
+    frames_data = _select_frames(tracking_data, period)
+
+    # Pass 1: count rows so every column can be preallocated
+    n = sum(len(frame_data.get("player_data", [])) for frame_data in frames_data)
+
+    frames = np.empty(n, dtype=np.int32)
+    timestamps = np.empty(n, dtype=object)
+    periods = np.empty(n, dtype=np.int32)
+    player_ids = np.empty(n, dtype=np.int32)
+    xs = np.empty(n, dtype=np.float32)
+    ys = np.empty(n, dtype=np.float32)
+    is_detected = np.empty(n, dtype=np.bool_) if include_is_detected else None
+
+    # Pass 2: fill by index (frame fields are broadcast per slice)
+    i = 0
+    for frame_data in frames_data:
+        players = frame_data.get("player_data", [])
+        j = i + len(players)
+        frames[i:j] = frame_data["frame"]
+        timestamps[i:j] = frame_data["timestamp"]
+        periods[i:j] = frame_data["period"]
+
+        for player in players:
+            player_ids[i] = player["player_id"]
+            xs[i] = player["x"]
+            ys[i] = player["y"]
+            if include_is_detected:
+                is_detected[i] = player["is_detected"]
+            i += 1
+
+    columns = {
+        "frame": frames,
+        "timestamp": pd.Categorical(timestamps),
+        "period": periods,
+        "player_id": player_ids,
+        "x": xs,
+        "y": ys,
+    }
+    if include_is_detected:
+        columns["is_detected"] = is_detected
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(columns)
 
 
 def get_ball_dataframe(tracking_data, period=None):
@@ -142,34 +364,44 @@ def get_ball_dataframe(tracking_data, period=None):
     Extract ball positions from tracking data.
 
     Args:
-        tracking_data (list): Frame dicts from load_match_data()
+        tracking_data (list): Parsed frame dicts (one per line of the raw
+            tracking JSONL)
         period (int, optional): Filter by period (1 or 2)
 
     Returns:
         pd.DataFrame: Columns: frame, timestamp, period, x, y
     """
-    rows = []
-
-    for frame_data in tracking_data:
-        if frame_data.get("period") is None:
-            continue
-
-        if period is not None and frame_data["period"] != period:
-            continue
-
-        ball = frame_data.get("ball_data")
-        if ball:
-            rows.append(
-                {
-                    "frame": frame_data["frame"],
-                    "timestamp": frame_data["timestamp"],
-                    "period": frame_data["period"],
-                    "x": ball.get("x"),
-                    "y": ball.get("y"),
-                }
-            )
-
-    return pd.DataFrame(rows)
+    frames_data = [
+        frame_data
+        for frame_data in _select_frames(tracking_data, period)
+        if frame_data.get("ball_data")
+    ]
+    n = len(frames_data)
+
+    frames = np.empty(n, dtype=np.int32)
+    timestamps = np.empty(n, dtype=object)
+    periods = np.empty(n, dtype=np.int32)
+    xs = np.empty(n, dtype=np.float32)
+    ys = np.empty(n, dtype=np.float32)
+
+    for i, frame_data in enumerate(frames_data):
+        ball = frame_data["ball_data"]
+        x, y = ball.get("x"), ball.get("y")
+        frames[i] = frame_data["frame"]
+        timestamps[i] = frame_data["timestamp"]
+        periods[i] = frame_data["period"]
+        xs[i] = np.nan if x is None else x
+        ys[i] = np.nan if y is None else y
+
+    return pd.DataFrame(
+        {
+            "frame": frames,
+            "timestamp": pd.Categorical(timestamps),
+            "period": periods,
+            "x": xs,
+            "y": ys,
+        }
+    )
 
 
 def get_possession_info(tracking_data):
@@ -177,27 +409,61 @@ def get_possession_info(tracking_data):
     Extract possession information from tracking data.
 
     Args:
-        tracking_data (list): Frame dicts from load_match_data()
+        tracking_data (list): Parsed frame dicts (one per line of the raw
+            tracking JSONL)
 
     Returns:
         pd.DataFrame: Columns: frame, timestamp, period, player_id, group
     """
-    rows = []
+    frames_data = [
+        frame_data
+        for frame_data in _select_frames(tracking_data)
+        if frame_data.get("possession")
+    ]
+    n = len(frames_data)
+
+    frames = np.empty(n, dtype=np.int32)
+    timestamps = np.empty(n, dtype=object)
+    periods = np.empty(n, dtype=np.int32)
+    # float64 so frames without a possessor keep NaN
+    player_ids = np.empty(n, dtype=np.float64)
+    groups = np.empty(n, dtype=object)
+
+    for i, frame_data in enumerate(frames_data):
+        poss = frame_data["possession"]
+        player_id = poss.get("player_id")
+        frames[i] = frame_data["frame"]
+        timestamps[i] = frame_data["timestamp"]
+        periods[i] = frame_data["period"]
+        player_ids[i] = np.nan if player_id is None else player_id
+        groups[i] = poss.get("group")
+
+    return pd.DataFrame(
+        {
+            "frame": frames,
+            "timestamp": pd.Categorical(timestamps),
+            "period": periods,
+            "player_id": player_ids,
+            "group": groups,
+        }
+    )
 
-    for frame_data in tracking_data:
-        if frame_data.get("period") is None:
-            continue
 
-        poss = frame_data.get("possession")
-        if poss:
-            rows.append(
-                {
-                    "frame": frame_data["frame"],
-                    "timestamp": frame_data["timestamp"],
-                    "period": frame_data["period"],
-                    "player_id": poss.get("player_id"),
-                    "group": poss.get("group"),
-                }
-            )
+def get_team_player_ids(possession_df):
+    """
+    Player IDs per team, taken from the possession groups.
+
+    Args:
+        possession_df (pd.DataFrame): Output of get_possession_info()
+
+    Returns:
+        tuple: (home_player_ids, away_player_ids) as sorted lists of ints
+    """
+    poss = possession_df[["group", "player_id"]].dropna()
+    groups = poss["group"].to_numpy()
+    player_ids = poss["player_id"].to_numpy().astype(np.int32)
+
+    home_player_ids = np.unique(player_ids[groups == "home team"]).tolist()
+    away_player_ids = np.unique(player_ids[groups == "away team"]).tolist()
 
-    return pd.DataFrame(rows)
+    return home_player_ids, away_player_ids
@@ -2,16 +2,73 @@
 Space analysis using Voronoi diagrams to measure off-ball run effectiveness
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
+from functools import partial
+
 import numpy as np
 import pandas as pd
 from scipy.spatial import Voronoi
 from tqdm import tqdm
 
+TRAJECTORY_COLUMNS = (
+    "run_id",
+    "player_id",
+    "team",
+    "start_frame",
+    "end_frame",
+    "duration_frames",
+    "start_x",
+    "start_y",
+    "end_x",
+    "end_y",
+    "max_velocity",
+    "total_space_created",
+    "match_id",
+    "period",
+)
+
+# Default cap on parallel match workers: each one holds a full match (and, on
+# a cold cache, parses its raw tracking JSONL) in memory
+MAX_MATCH_WORKERS = 4
+
+
+def build_frame_index(df):
+    """
+    Index tracking rows by frame for repeated per-frame lookups.
+
+    Args:
+        df (pd.DataFrame): Tracking data
+
+    Returns:
+        dict: {frame: (points (n, 2) float64 array, player_ids array)}
+    """
+    frames = df["frame"].to_numpy()
+    if len(frames) == 0:
+        return {}
+
+    order = np.argsort(frames, kind="stable")
+    frames = frames[order]
+    points = df[["x", "y"]].to_numpy(dtype=np.float64)[order]
+    player_ids = df["player_id"].to_numpy()[order]
+
+    starts = np.flatnonzero(np.r_[True, frames[1:] != frames[:-1]])
+    ends = np.r_[starts[1:], len(frames)]
+
+    return {
+        frame: (points[start:end], player_ids[start:end])
+        for frame, start, end in zip(frames[starts].tolist(), starts, ends)
+    }
+
 
 def calculate_voronoi_areas(df, frame_number, pitch_length=105, pitch_width=68):
     """
     Calculate controlled area per player using Voronoi tessellation.
 
+    Cells are bounded by the pitch (points are mirrored across the four
+    boundaries), so all areas are finite and sum to the pitch area.
+
     Args:
         df (pd.DataFrame): Tracking data
         frame_number (int): Frame to analyze
@@ -23,40 +80,190 @@ def calculate_voronoi_areas(df, frame_number, pitch_length=105, pitch_width=68):
     """
     frame_df = df[df["frame"] == frame_number]
 
-    if len(frame_df) < 4:
-        return {}
+    return voronoi_areas_from_points(
+        frame_df[["x", "y"]].values.astype(np.float64),
+        frame_df["player_id"].values,
+        pitch_length,
+        pitch_width,
+    )
+
+
+def pitch_voronoi_cells(points, pitch_length=105, pitch_width=68):
+    """
+    Voronoi cells of players, bounded and clipped by the pitch.
+
+    All players are mirrored across the four pitch boundaries, so every real
+    player's cell is finite and equals its cell clipped to the pitch.
+
+    Args:
+        points (np.ndarray): (n, 2) player positions in meters
+        pitch_length (float): Pitch length in meters
+        pitch_width (float): Pitch width in meters
+
+    Coincident positions (e.g. two players beyond the same corner, which
+    both clip to it) get one cell, returned for each of them.
+
+    Returns:
+        tuple: (vertices (m, 2) array, list of n vertex-index lists, one
+            region per input point)
+
+    Raises:
+        scipy.spatial.QhullError: If the points are degenerate
+    """
+    # Players slightly off the pitch are pulled just inside first, otherwise
+    # their mirror image would land on the field
+    half_length, half_width = pitch_length / 2, pitch_width / 2
+    eps = 1e-3
+    x = np.clip(points[:, 0], -half_length + eps, half_length - eps)
+    y = np.clip(points[:, 1], -half_width + eps, half_width - eps)
+
+    # Qhull needs distinct sites; coincident players share one cell
+    unique, site = np.unique(x + 1j * y, return_inverse=True)
+    if len(unique) < len(x):
+        x, y = unique.real, unique.imag
+    else:
+        site = np.arange(len(x))
+
+    reflected = np.vstack(
+        [
+            np.column_stack([x, y]),
+            np.column_stack([-2 * half_length - x, y]),
+            np.column_stack([2 * half_length - x, y]),
+            np.column_stack([x, -2 * half_width - y]),
+            np.column_stack([x, 2 * half_width - y]),
+        ]
+    )
+
+    vor = Voronoi(reflected)
+    point_regions = vor.point_region[site.reshape(-1)]
+    return vor.vertices, [vor.regions[region_index] for region_index in point_regions]
+
+
+def voronoi_areas_from_points(points, player_ids, pitch_length=105, pitch_width=68):
+    """
+    Calculate controlled area per player for a single frame's positions.
+
+    Players at the same position split their shared cell equally, so the
+    areas always sum to the pitch area.
 
-    points = frame_df[["x", "y"]].values
-    player_ids = frame_df["player_id"].values
+    Args:
+        points (np.ndarray): (n, 2) player positions in meters
+        player_ids (np.ndarray): Player IDs aligned with points
+        pitch_length (float): Pitch length in meters
+        pitch_width (float): Pitch width in meters
+
+    Returns:
+        dict: {player_id: controlled_area_m2}
+    """
+    if len(points) < 4:
+        return {}
 
     try:
-        vor = Voronoi(points)
+        vertices, regions = pitch_voronoi_cells(points, pitch_length, pitch_width)
     except:
         return {}
 
-    areas = {}
-    max_area = pitch_length * pitch_width
-    avg_area = max_area / len(player_ids)
+    # Pad regions to equal length by repeating their last vertex, which adds
+    # zero-length edges and leaves the shoelace sum unchanged
+    max_k = max(len(region) for region in regions)
+    padded = np.array(
+        [region + region[-1:] * (max_k - len(region)) for region in regions]
+    )
+
+    # Shoelace formula for all cells at once: (n, max_k, 2)
+    cells = vertices[padded]
+    vx, vy = cells[..., 0], cells[..., 1]
+    areas = 0.5 * np.abs(
+        (vx * np.roll(vy, -1, axis=1) - np.roll(vx, -1, axis=1) * vy).sum(axis=1)
+    )
+
+    # Distinct cells never share a vertex list, so equal rows are one cell
+    if len(set(map(tuple, regions))) < len(regions):
+        _, cell, counts = np.unique(
+            padded, axis=0, return_inverse=True, return_counts=True
+        )
+        areas = areas / counts[cell.reshape(-1)]
+
+    return dict(zip(player_ids, areas))
+
+
+def _frame_voronoi_areas(
+    df, frame_number, frame_index=None, pitch_length=105, pitch_width=68
+):
+    """Voronoi areas for a frame, looked up in `frame_index` when given."""
+    if frame_index is None:
+        return calculate_voronoi_areas(df, frame_number, pitch_length, pitch_width)
+    if frame_number not in frame_index:
+        return {}
+    return voronoi_areas_from_points(
+        *frame_index[frame_number], pitch_length, pitch_width
+    )
+
 
-    for i, player_id in enumerate(player_ids):
-        region_index = vor.point_region[i]
-        region = vor.regions[region_index]
+def _nearby_cached_areas(frame_number, cache, frame_index, drift_tolerance):
+    """
+    Areas of an adjacent, already computed frame if no player has moved more
+    than `drift_tolerance` meters since then, else None.
+    """
+    if frame_number not in frame_index:
+        return None
 
-        # Handle infinite/invalid regions
-        if -1 in region or len(region) < 3:
-            areas[player_id] = avg_area
+    points, player_ids = frame_index[frame_number]
+    for neighbour in (frame_number - 1, frame_number + 1):
+        if neighbour not in cache or neighbour not in frame_index:
             continue
+        neighbour_points, neighbour_ids = frame_index[neighbour]
+        if not np.array_equal(player_ids, neighbour_ids):
+            continue
+        drift = np.hypot(*(points - neighbour_points).T).max()
+        if drift < drift_tolerance:
+            return cache[neighbour]
+
+    return None
 
-        # Shoelace formula for polygon area
-        vertices = vor.vertices[region]
-        x, y = vertices[:, 0], vertices[:, 1]
-        area = 0.5 * np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
-        areas[player_id] = min(area, max_area)
 
-    return areas
+def _cached_voronoi_areas(
+    df,
+    frame_number,
+    cache,
+    frame_index=None,
+    drift_tolerance=None,
+    pitch_length=105,
+    pitch_width=68,
+):
+    """Voronoi areas for a frame, reusing a previous result from `cache`."""
+    if cache is None:
+        return _frame_voronoi_areas(
+            df, frame_number, frame_index, pitch_length, pitch_width
+        )
+    if frame_number in cache:
+        return cache[frame_number]
+
+    # Approximate with a neighbouring frame's exact areas; these are not
+    # cached, so the error never compounds beyond one tolerance
+    if drift_tolerance is not None and frame_index is not None:
+        areas = _nearby_cached_areas(frame_number, cache, frame_index, drift_tolerance)
+        if areas is not None:
+            return areas
 
+    cache[frame_number] = _frame_voronoi_areas(
+        df, frame_number, frame_index, pitch_length, pitch_width
+    )
+    return cache[frame_number]
 
-def measure_space_creation(df, player_id, start_frame, end_frame, target_player_id):
+
+def measure_space_creation(
+    df,
+    player_id,
+    start_frame,
+    end_frame,
+    target_player_id,
+    cache=None,
+    frame_index=None,
+    drift_tolerance=None,
+    pitch_length=105,
+    pitch_width=68,
+):
     """
     Measure space created for a specific player by comparing Voronoi areas.
 
@@ -66,12 +273,36 @@ def measure_space_creation(df, player_id, start_frame, end_frame, target_player_
         start_frame (int): Frame before run
         end_frame (int): Frame after run
         target_player_id (int): Player to measure space creation for (ball carrier)
+        cache (dict, optional): {frame: areas} shared across calls on the same df
+        frame_index (dict, optional): Output of build_frame_index(df), avoids
+            scanning df for every frame
+        drift_tolerance (float, optional): Reuse a cached adjacent frame's
+            areas when no player moved more than this many meters (default:
+            None, always exact; needs cache and frame_index)
+        pitch_length (float): Pitch length in meters
+        pitch_width (float): Pitch width in meters
 
     Returns:
         float: Space gained in m² (0 if negative)
     """
-    areas_before = calculate_voronoi_areas(df, start_frame)
-    areas_after = calculate_voronoi_areas(df, end_frame)
+    areas_before = _cached_voronoi_areas(
+        df,
+        start_frame,
+        cache,
+        frame_index,
+        drift_tolerance,
+        pitch_length,
+        pitch_width,
+    )
+    areas_after = _cached_voronoi_areas(
+        df,
+        end_frame,
+        cache,
+        frame_index,
+        drift_tolerance,
+        pitch_length,
+        pitch_width,
+    )
 
     if not areas_before or not areas_after:
         return 0.0
@@ -90,6 +321,10 @@ def analyze_offball_runs(
     away_player_ids,
     velocity_threshold=5.0,
     window_frames=30,
+    drift_tolerance=None,
+    max_carrier_distance=None,
+    pitch_length=105,
+    pitch_width=68,
 ):
     """
     Detect and analyze off-ball runs during own team possession.
@@ -102,11 +337,20 @@ def analyze_offball_runs(
         away_player_ids (list): Away team player IDs
         velocity_threshold (float): Min velocity in m/s (default: 5.0)
         window_frames (int): Frames to measure impact (default: 30 = 3 sec)
+        drift_tolerance (float, optional): Max player movement in meters for
+            which an adjacent frame's Voronoi areas are reused (default: None,
+            every frame exact)
+        max_carrier_distance (float, optional): Skip run frames where the
+            runner is farther than this many meters from the ball carrier
+            (default: None, no distance filter)
+        pitch_length (float): Pitch length in meters (default: 105)
+        pitch_width (float): Pitch width in meters (default: 68)
 
     Returns:
-        pd.DataFrame: Analyzed runs with space creation for ball carrier
+        pd.DataFrame: Analyzed runs (with runner x, y) and space created for
+            the ball carrier
     """
-    from src.utils import detect_runs
+    from src.utils import calculate_distance, detect_runs
 
     # Player to team mapping
     player_to_team = {}
@@ -120,53 +364,86 @@ def analyze_offball_runs(
 
     print(f"\nAnalyzing {len(runs):,} run frames (team possession filter)...")
 
-    results = []
-
-    for idx, run in tqdm(runs.iterrows(), total=len(runs), desc="Analyzing runs"):
-        player_id = run["player_id"]
-        frame = run["frame"]
-
-        runner_team = player_to_team.get(player_id)
-        if runner_team is None:
-            continue
-
-        # Check possession
-        poss_frame = possession_df[possession_df["frame"] == frame]
-        if len(poss_frame) == 0:
-            continue
-
-        poss_player_id = poss_frame.iloc[0]["player_id"]
-        if pd.isna(poss_player_id):
-            continue
-
-        # Skip if runner has ball
-        if poss_player_id == player_id:
-            continue
-
-        # Check if own team has possession
-        poss_team = player_to_team.get(poss_player_id)
-        if poss_team is None or runner_team != poss_team:
-            continue
-
-        # Measure space created for ball carrier only
-        space_created = measure_space_creation(
-            df, player_id, frame, frame + window_frames, poss_player_id
+    # Attach the ball carrier of each run frame (frame -> player_id lookup,
+    # first possession row per frame)
+    carriers = possession_df.drop_duplicates("frame").set_index("frame")["player_id"]
+    runs = runs.assign(ball_carrier_id=runs["frame"].map(carriers))
+    runs["team"] = runs["player_id"].map(player_to_team)
+    carrier_team = runs["ball_carrier_id"].map(player_to_team)
+
+    # Keep frames where a teammate of the runner (not the runner) has the ball;
+    # frames without a known carrier map to NaN and drop out here
+    runs = runs[
+        runs["team"].notna()
+        & (runs["team"] == carrier_team)
+        & (runs["ball_carrier_id"] != runs["player_id"])
+    ].reset_index(drop=True)
+    runs["ball_carrier_id"] = runs["ball_carrier_id"].astype(int)
+
+    # Optionally drop runs too far from the ball carrier before any Voronoi
+    # work; frames where the carrier is not tracked score 0 anyway
+    if max_carrier_distance is not None:
+        carrier_positions = df[["frame", "player_id", "x", "y"]].rename(
+            columns={
+                "player_id": "ball_carrier_id",
+                "x": "carrier_x",
+                "y": "carrier_y",
+            }
         )
-
-        if space_created > 0:
-            results.append(
-                {
-                    "frame": frame,
-                    "player_id": player_id,
-                    "ball_carrier_id": int(poss_player_id),
-                    "team": runner_team,
-                    "velocity": run["velocity"],
-                    "space_created": space_created,
-                    "is_detected": run["is_detected"],
-                }
-            )
-
-    results_df = pd.DataFrame(results)
+        runs = runs.merge(
+            carrier_positions, on=["frame", "ball_carrier_id"], how="left"
+        )
+        distance = calculate_distance(
+            runs["x"], runs["y"], runs["carrier_x"], runs["carrier_y"]
+        )
+        runs = runs[distance <= max_carrier_distance].reset_index(drop=True)
+
+    # Concurrent runners and consecutive run frames share the same start/end
+    # frames, so each frame's Voronoi is computed once
+    voronoi_cache = {}
+    frame_index = build_frame_index(df)
+
+    # Measure space created for ball carrier only
+    space_created = np.zeros(len(runs))
+    for i, (player_id, frame, carrier_id) in enumerate(
+        tqdm(
+            zip(
+                runs["player_id"].tolist(),
+                runs["frame"].tolist(),
+                runs["ball_carrier_id"].tolist(),
+            ),
+            total=len(runs),
+            desc="Analyzing runs",
+        )
+    ):
+        space_created[i] = measure_space_creation(
+            df,
+            player_id,
+            frame,
+            frame + window_frames,
+            carrier_id,
+            cache=voronoi_cache,
+            frame_index=frame_index,
+            drift_tolerance=drift_tolerance,
+            pitch_length=pitch_length,
+            pitch_width=pitch_width,
+        )
+    runs["space_created"] = space_created
+
+    columns = [
+        "frame",
+        "player_id",
+        "ball_carrier_id",
+        "team",
+        "x",
+        "y",
+        "velocity",
+        "space_created",
+    ]
+    if "is_detected" in runs.columns:
+        columns.append("is_detected")
+
+    results_df = runs.loc[runs["space_created"] > 0, columns].reset_index(drop=True)
     print(f"✓ Analyzed {len(results_df)} off-ball runs (space for ball carrier only)")
 
     return results_df
@@ -185,154 +462,282 @@ def group_runs_to_trajectories(runs_df):
     if len(runs_df) == 0:
         return pd.DataFrame()
 
-    # Check if run_id exists, if not create it
-    if "run_id" not in runs_df.columns:
-        runs_df = runs_df.sort_values(["player_id", "frame"])
-        runs_df["frame_diff"] = runs_df.groupby("player_id")["frame"].diff()
-        runs_df["is_new_run"] = (runs_df["frame_diff"] > 1) | (
-            runs_df["frame_diff"].isna()
+    frames = runs_df["frame"].to_numpy()
+
+    if "run_id" in runs_df.columns:
+        # Order rows by run (in order of first appearance), then frame, so
+        # each run is one contiguous block
+        run_codes, run_ids = pd.factorize(runs_df["run_id"])
+
+        # Rows without a run ID (code -1) belong to no trajectory
+        labelled = np.flatnonzero(run_codes >= 0)
+        if len(labelled) == 0:
+            return pd.DataFrame()
+
+        order = labelled[np.lexsort((frames[labelled], run_codes[labelled]))]
+        run_codes = run_codes[order]
+        starts = np.flatnonzero(np.r_[True, run_codes[1:] != run_codes[:-1]])
+        run_labels = np.asarray(run_ids)[run_codes[starts]]
+    else:
+        # Order rows by player, then frame; a run starts wherever the player
+        # changes or a frame is skipped
+        player_ids = runs_df["player_id"].to_numpy()
+        order = np.lexsort((frames, player_ids))
+        sorted_players, sorted_frames = player_ids[order], frames[order]
+        is_start = np.ones(len(order), dtype=bool)
+        is_start[1:] = (sorted_players[1:] != sorted_players[:-1]) | (
+            np.diff(sorted_frames) > 1
         )
-        runs_df["run_id"] = runs_df.groupby("player_id")["is_new_run"].cumsum()
-        runs_df["run_id"] = (
-            runs_df["player_id"].astype(str) + "_" + runs_df["run_id"].astype(str)
+        starts = np.flatnonzero(is_start)
+
+        # Label runs "<player_id>_<n>", numbering each player's runs from 1
+        run_players = sorted_players[starts]
+        run_index = np.arange(len(starts))
+        is_first_run = np.r_[True, run_players[1:] != run_players[:-1]]
+        run_number = run_index - np.maximum.accumulate(
+            np.where(is_first_run, run_index, 0)
         )
+        run_labels = [
+            f"{player_id}_{number + 1}"
+            for player_id, number in zip(run_players.tolist(), run_number.tolist())
+        ]
+
+    ends = np.r_[starts[1:], len(order)] - 1
+    first, last = order[starts], order[ends]
+
+    x = runs_df["x"].to_numpy()
+    y = runs_df["y"].to_numpy()
+    space_created = runs_df["space_created"].to_numpy()
+
+    trajectories = pd.DataFrame(
+        {
+            "run_id": run_labels,
+            "player_id": runs_df["player_id"].to_numpy()[first],
+            "team": runs_df["team"].to_numpy()[first],
+            "start_frame": frames[first],
+            "end_frame": frames[last],
+            "duration_frames": ends - starts + 1,
+            "start_x": x[first],
+            "start_y": y[first],
+            "end_x": x[last],
+            "end_y": y[last],
+            "max_velocity": np.fmax.reduceat(
+                runs_df["velocity"].to_numpy()[order], starts
+            ),
+            # Space created as DELTA (end - start)
+            "total_space_created": space_created[last] - space_created[first],
+        }
+    )
 
-    trajectories = []
+    # Add match_id only if it exists
+    if "match_id" in runs_df.columns:
+        trajectories["match_id"] = runs_df["match_id"].to_numpy()[first]
 
-    for run_id in runs_df["run_id"].unique():
-        run = runs_df[runs_df["run_id"] == run_id].sort_values("frame")
+    return trajectories
 
-        if len(run) == 0:
+
+@contextmanager
+def _silenced(enabled=True):
+    """Discard stdout/stderr (prints and tqdm bars) inside the block."""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, "w") as devnull:
+        with redirect_stdout(devnull), redirect_stderr(devnull):
+            yield
+
+
+def _iter_match_trajectories(
+    match_id,
+    data_loader_func,
+    velocity_threshold,
+    drift_tolerance=None,
+    max_carrier_distance=None,
+):
+    """Load one match and yield its normalized trajectories per period."""
+    from src.data_loader import get_team_player_ids
+    from src.utils import calculate_velocity
+
+    data = data_loader_func(match_id)
+    metadata = data["metadata"]
+    home_team_side = metadata.get("home_team_side", [])
+    # Cells are mirrored across the pitch edges, so use this match's size
+    pitch_length = metadata.get("pitch_length") or 105
+    pitch_width = metadata.get("pitch_width") or 68
+    tracking_by_period = data["tracking_by_period"]
+    poss_df = data["possession_df"]
+
+    # Get team IDs from possession data (shared by both periods)
+    home_player_ids, away_player_ids = get_team_player_ids(poss_df)
+
+    if len(home_player_ids) == 0 or len(away_player_ids) == 0:
+        return
+
+    for period in [1, 2]:
+        df = tracking_by_period.get(period)
+        if df is None or len(df) == 0:
             continue
 
-        # Get first and last frame
-        start = run.iloc[0]
-        end = run.iloc[-1]
-
-        # Calculate space created as DELTA (end - start)
-        space_delta = end["space_created"] - start["space_created"]
-
-        # Build trajectory dict (only include columns that exist)
-        traj = {
-            "run_id": run_id,
-            "player_id": start["player_id"],
-            "team": start["team"],
-            "start_frame": start["frame"],
-            "end_frame": end["frame"],
-            "duration_frames": len(run),
-            "start_x": start["x"],
-            "start_y": start["y"],
-            "end_x": end["x"],
-            "end_y": end["y"],
-            "max_velocity": run["velocity"].max(),
-            "total_space_created": space_delta,
-        }
+        df_vel = calculate_velocity(df)
+        runs = analyze_offball_runs(
+            df_vel,
+            poss_df,
+            home_player_ids,
+            away_player_ids,
+            velocity_threshold,
+            pitch_length=pitch_length,
+            pitch_width=pitch_width,
+            drift_tolerance=drift_tolerance,
+            max_carrier_distance=max_carrier_distance,
+        )
 
-        # Add match_id only if it exists
-        if "match_id" in start.index:
-            traj["match_id"] = start["match_id"]
+        if len(runs) == 0:
+            continue
+
+        traj = group_runs_to_trajectories(runs)
+
+        if len(traj) == 0:
+            continue
+
+        # Normalize attack direction
+        period_idx = period - 1
+        if period_idx < len(home_team_side):
+            home_direction = home_team_side[period_idx]
+
+            # Flip home runs if home attacks right to left, else away runs
+            is_home = traj["team"].to_numpy() == "home"
+            flip = is_home == (home_direction == "right_to_left")
+            sign = np.where(flip, -1, 1).astype(traj["start_x"].dtype)
+            traj["start_x"] = traj["start_x"].to_numpy() * sign
+            traj["end_x"] = traj["end_x"].to_numpy() * sign
+
+        traj["match_id"] = match_id
+        traj["period"] = period
+        yield traj
+
+
+def _process_one_match(
+    match,
+    data_loader_func,
+    velocity_threshold=5.0,
+    drift_tolerance=None,
+    max_carrier_distance=None,
+    quiet=False,
+):
+    """
+    Load one match and return its normalized trajectories, one per period.
+
+    Args:
+        match (dict): Match dict with 'id' key
+        data_loader_func: Function to load match data
+        velocity_threshold (float): Min velocity in m/s (default: 5.0)
+        drift_tolerance (float, optional): See analyze_offball_runs
+        max_carrier_distance (float, optional): See analyze_offball_runs
+        quiet (bool): Suppress per-match prints and progress bars, e.g. in
+            worker processes whose output would interleave
+
+    Returns:
+        list: Trajectory DataFrames (empty if the match could not be analyzed)
+    """
+    match_id = match["id"]
+    trajectories = []
+
+    try:
+        with _silenced(quiet):
+            for traj in _iter_match_trajectories(
+                match_id,
+                data_loader_func,
+                velocity_threshold,
+                drift_tolerance=drift_tolerance,
+                max_carrier_distance=max_carrier_distance,
+            ):
+                trajectories.append(traj)
 
-        trajectories.append(traj)
+    except Exception as e:
+        print(f"Error processing match {match_id}: {e}")
 
-    return pd.DataFrame(trajectories)
+    return trajectories
 
 
-def analyze_all_matches_normalized(matches, data_loader_func, velocity_threshold=5.0):
+def analyze_all_matches_normalized(
+    matches,
+    data_loader_func,
+    velocity_threshold=5.0,
+    max_workers=1,
+    drift_tolerance=None,
+    max_carrier_distance=None,
+):
     """
     Analyze all matches with normalized attack direction (left to right).
 
     Args:
         matches (list): Match dicts with 'id' key
-        data_loader_func: Function to load match data
+        data_loader_func: Function to load match data (must be picklable,
+            i.e. defined at module level, when max_workers > 1)
         velocity_threshold (float): Min velocity in m/s (default: 5.0)
+        max_workers (int, optional): Matches analyzed in parallel processes
+            (default: 1, analyzed in this process; None: one per CPU core,
+            at most MAX_MATCH_WORKERS). With more than one worker, scripts
+            must call this under `if __name__ == "__main__":`
+        drift_tolerance (float, optional): Max player movement in meters for
+            which an adjacent frame's Voronoi areas are reused (default:
+            None, every frame exact)
+        max_carrier_distance (float, optional): Skip run frames where the
+            runner is farther than this many meters from the ball carrier
+            (default: None, no distance filter)
 
     Returns:
         pd.DataFrame: All trajectories normalized to left-to-right attack
     """
-    from src.data_loader import get_tracking_dataframe, get_possession_info
-    from src.utils import calculate_velocity
-
-    all_trajectories = []
+    # Collect each column's per-period arrays and concatenate once at the end
+    columns = {column: [] for column in TRAJECTORY_COLUMNS}
 
     print(f"\n=== ANALYZING ALL MATCHES (threshold: {velocity_threshold} m/s) ===\n")
 
-    for match in tqdm(matches, desc="Processing matches"):
-        match_id = match["id"]
-
-        try:
-            data = data_loader_func(match_id)
-            home_team_side = data["metadata"].get("home_team_side", [])
-
-            for period in [1, 2]:
-                df = get_tracking_dataframe(data["tracking"], period=period)
-                if len(df) == 0:
-                    continue
-
-                poss_df = get_possession_info(data["tracking"])
-
-                # Get team IDs from possession data
-                home_player_ids = list(
-                    poss_df[poss_df["group"] == "home team"]["player_id"]
-                    .dropna()
-                    .astype(int)
-                    .unique()
-                )
-                away_player_ids = list(
-                    poss_df[poss_df["group"] == "away team"]["player_id"]
-                    .dropna()
-                    .astype(int)
-                    .unique()
-                )
-
-                if len(home_player_ids) == 0 or len(away_player_ids) == 0:
-                    continue
-
-                df_vel = calculate_velocity(df)
-                runs = analyze_offball_runs(
-                    df_vel,
-                    poss_df,
-                    home_player_ids,
-                    away_player_ids,
-                    velocity_threshold,
-                )
-
-                if len(runs) == 0:
-                    continue
-
-                runs = runs.merge(
-                    df_vel[["frame", "player_id", "x", "y"]],
-                    on=["frame", "player_id"],
-                    how="left",
-                )
-                traj = group_runs_to_trajectories(runs)
-
-                if len(traj) == 0:
-                    continue
-
-                # Normalize attack direction
-                period_idx = period - 1
-                if period_idx < len(home_team_side):
-                    home_direction = home_team_side[period_idx]
-
-                    if home_direction == "right_to_left":
-                        mask_home = traj["team"] == "home"
-                        traj.loc[mask_home, ["start_x", "end_x"]] *= -1
-                    else:
-                        mask_away = traj["team"] == "away"
-                        traj.loc[mask_away, ["start_x", "end_x"]] *= -1
-
-                traj["match_id"] = match_id
-                traj["period"] = period
-                all_trajectories.append(traj)
-
-        except Exception as e:
-            print(f"Error processing match {match_id}: {e}")
-            continue
-
-    if len(all_trajectories) == 0:
+    # Each match once: two workers on the same ID would download and cache
+    # the same files concurrently
+    unique_matches = {}
+    for match in matches:
+        unique_matches.setdefault(str(match["id"]), match)
+    matches = list(unique_matches.values())
+
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, MAX_MATCH_WORKERS)
+    max_workers = max(1, min(max_workers, len(matches)))
+
+    # Matches are independent and CPU-bound (Voronoi), so with several
+    # workers each one is analyzed in its own process (silenced so their
+    # output does not interleave); results come back in match order
+    process_match = partial(
+        _process_one_match,
+        data_loader_func=data_loader_func,
+        velocity_threshold=velocity_threshold,
+        drift_tolerance=drift_tolerance,
+        max_carrier_distance=max_carrier_distance,
+        quiet=max_workers > 1,
+    )
+    with ExitStack() as stack:
+        if max_workers > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=max_workers)
+            )
+            results = executor.map(process_match, matches)
+        else:
+            results = map(process_match, matches)
+
+        for trajectories in tqdm(
+            results, total=len(matches), desc="Processing matches"
+        ):
+            for traj in trajectories:
+                for column, arrays in columns.items():
+                    arrays.append(traj[column].to_numpy())
+
+    if len(columns["run_id"]) == 0:
         return pd.DataFrame()
 
-    combined = pd.concat(all_trajectories, ignore_index=True)
+    combined = pd.DataFrame(
+        {column: np.concatenate(arrays) for column, arrays in columns.items()}
+    )
 
     print(f"\n✓ Total runs: {len(combined)}")
     print(f"✓ Avg velocity: {combined['max_velocity'].mean():.2f} m/s")
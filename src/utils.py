@@ -13,7 +13,27 @@ def calculate_distance(x1, y1, x2, y2):
     Returns:
         float or np.array: Distance in meters
     """
-    return np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    return np.hypot(x2 - x1, y2 - y1)
+
+
+def timestamp_to_seconds(timestamps):
+    """
+    Convert "HH:MM:SS.ff" timestamps to seconds.
+
+    Categorical columns are parsed once per category instead of per row.
+
+    Args:
+        timestamps (pd.Series): Timestamp strings (object or category dtype)
+
+    Returns:
+        np.array: Seconds as float64
+    """
+    if isinstance(timestamps.dtype, pd.CategoricalDtype):
+        seconds = pd.to_timedelta(timestamps.cat.categories).total_seconds()
+        codes = timestamps.cat.codes.to_numpy()
+        return np.where(codes >= 0, np.asarray(seconds)[codes], np.nan)
+
+    return pd.to_timedelta(timestamps).dt.total_seconds().to_numpy()
 
 
 def calculate_velocity(df, player_id=None):
@@ -27,27 +47,32 @@ def calculate_velocity(df, player_id=None):
     Returns:
         pd.DataFrame: Original DataFrame with added 'velocity' column (m/s)
     """
-    df = df.copy()
-
     if player_id is not None:
-        df = df[df["player_id"] == player_id].copy()
+        df = df[df["player_id"] == player_id]
 
-    df = df.sort_values(["player_id", "frame"]).reset_index(drop=True)
+    # sort_values already returns a new frame, so the input is never modified
+    df = df.sort_values(["player_id", "frame"], ignore_index=True)
 
-    # Calculate distance and time delta
-    df["x_diff"] = df.groupby("player_id")["x"].diff()
-    df["y_diff"] = df.groupby("player_id")["y"].diff()
-    df["distance"] = np.sqrt(df["x_diff"] ** 2 + df["y_diff"] ** 2)
+    if len(df) == 0:
+        df["velocity"] = np.zeros(0)
+        return df
 
-    # Time delta in seconds
-    df["time_delta"] = pd.to_timedelta(df["timestamp"]).dt.total_seconds().diff()
+    x = df["x"].to_numpy()
+    y = df["y"].to_numpy()
+    seconds = timestamp_to_seconds(df["timestamp"])
+    player_ids = df["player_id"].to_numpy()
 
-    # Velocity
-    df["velocity"] = df["distance"] / df["time_delta"]
-    df["velocity"] = df["velocity"].fillna(0)
+    # Rows are sorted by player then frame, so each row's predecessor is the
+    # same player's previous frame unless a new player starts there
+    distance = np.zeros(len(df), dtype=x.dtype)
+    time_delta = np.zeros(len(df))
+    distance[1:] = np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2)
+    time_delta[1:] = np.diff(seconds)
+    time_delta[1:][player_ids[1:] != player_ids[:-1]] = 0
 
-    # Cleanup temporary columns
-    df = df.drop(["x_diff", "y_diff", "distance", "time_delta"], axis=1)
+    # Velocity (0 for each player's first frame)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["velocity"] = np.where(time_delta > 0, distance / time_delta, 0.0)
 
     return df
 
@@ -73,34 +98,26 @@ def detect_runs(df, velocity_threshold=5.0, min_duration=3.0):
         )
 
     # Filter for high velocity
-    high_speed = df[df["velocity"] >= velocity_threshold].copy()
-
-    # Group consecutive frames per player
+    high_speed = df[df["velocity"] >= velocity_threshold]
     high_speed = high_speed.sort_values(["player_id", "frame"]).reset_index(drop=True)
-    high_speed["frame_gap"] = high_speed.groupby("player_id")["frame"].diff()
-    high_speed["run_id"] = (high_speed["frame_gap"] > 1).cumsum()
-
-    # Calculate duration of each run
-    run_durations = (
-        high_speed.groupby(["player_id", "run_id"])
-        .agg({"timestamp": ["first", "last"]})
-        .reset_index()
-    )
-
-    run_durations.columns = ["player_id", "run_id", "start_time", "end_time"]
-    run_durations["duration"] = (
-        pd.to_timedelta(run_durations["end_time"]).dt.total_seconds()
-        - pd.to_timedelta(run_durations["start_time"]).dt.total_seconds()
-    )
-
-    # Filter runs >= min_duration
-    valid_runs = run_durations[run_durations["duration"] >= min_duration][
-        ["player_id", "run_id"]
-    ]
 
-    # Keep only frames from valid runs
-    runs = high_speed.merge(valid_runs, on=["player_id", "run_id"], how="inner")
-    runs = runs.drop(["frame_gap", "run_id"], axis=1)
+    # A run starts wherever the player changes or a frame is skipped
+    player_ids = high_speed["player_id"].to_numpy()
+    frames = high_speed["frame"].to_numpy()
+    is_start = np.ones(len(high_speed), dtype=bool)
+    is_start[1:] = (player_ids[1:] != player_ids[:-1]) | (np.diff(frames) > 1)
+    is_end = np.ones(len(high_speed), dtype=bool)
+    is_end[:-1] = is_start[1:]
+
+    # Duration of each run from its first and last timestamp
+    starts = np.flatnonzero(is_start)
+    ends = np.flatnonzero(is_end)
+    seconds = timestamp_to_seconds(high_speed["timestamp"])
+    duration = seconds[ends] - seconds[starts]
+
+    # Keep only frames from runs >= min_duration
+    keep = np.repeat(duration >= min_duration, ends - starts + 1)
+    runs = high_speed[keep].reset_index(drop=True)
 
     print(
         f"✓ Detected {len(runs):,} frames with velocity >= {velocity_threshold} m/s and duration >= {min_duration}s"
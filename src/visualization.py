@@ -2,12 +2,61 @@
 Visualization functions for football pitch and tracking data
 """
 
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import numpy as np
 import pandas as pd
 
 
+class FrameIndex:
+    """
+    Tracking DataFrame with the row positions of every frame, built once.
+
+    Pass it in place of the DataFrame to plot_players / plot_voronoi (and as
+    their ball_df) when drawing many frames of the same data, so each frame
+    is a positional slice instead of a scan of the whole frame column.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._build()
+
+    def _build(self):
+        self._length = len(self.df)
+        self._rows = self.df.groupby("frame", sort=False).indices
+
+    def frame(self, frame_number):
+        """Rows of one frame (empty if the frame is not tracked)."""
+        if len(self.df) != self._length:
+            self._build()
+
+        rows = self._rows.get(frame_number)
+        if rows is None:
+            return self.df.iloc[:0]
+
+        # Rebuild if the DataFrame was reordered or edited in place
+        if len(rows) and (self.df["frame"].to_numpy()[rows] != frame_number).any():
+            self._build()
+            return self.frame(frame_number)
+        return self.df.iloc[rows]
+
+
+def _frame_slice(data, frame_number):
+    """Rows of one frame from a DataFrame or a FrameIndex."""
+    if isinstance(data, FrameIndex):
+        return data.frame(frame_number)
+    return data[data["frame"] == frame_number]
+
+
 def draw_pitch(
     ax=None, pitch_length=105, pitch_width=68, color="white", linecolor="black"
 ):
@@ -100,6 +149,17 @@ def draw_pitch(
     return ax
 
 
+def _team_colors(player_ids, home_player_ids=None, away_player_ids=None):
+    """Blue/red/gray per player ID, or plain blue when no teams are given."""
+    if home_player_ids is None or away_player_ids is None:
+        return "blue"
+
+    # Home takes precedence if an ID appears in both lists
+    team_colors = dict.fromkeys(away_player_ids, "red")
+    team_colors.update(dict.fromkeys(home_player_ids, "blue"))
+    return player_ids.map(team_colors).fillna("gray").to_numpy()
+
+
 def plot_players(
     ax,
     df,
@@ -115,34 +175,24 @@ def plot_players(
 
     Args:
         ax: Matplotlib axis
-        df (pd.DataFrame): Tracking data
+        df (pd.DataFrame or FrameIndex): Tracking data
         frame_number (int): Frame to plot
         home_player_ids (list, optional): Home team player IDs (colored blue)
         away_player_ids (list, optional): Away team player IDs (colored red)
         show_ids (bool): Display player IDs as text
         show_ball (bool): Display ball position
-        ball_df (pd.DataFrame, optional): Ball tracking data
+        ball_df (pd.DataFrame or FrameIndex, optional): Ball tracking data
 
     Returns:
         matplotlib.axes.Axes: Updated axis
     """
-    frame_df = df[df["frame"] == frame_number]
+    frame_df = _frame_slice(df, frame_number)
 
     if len(frame_df) == 0:
         return ax
 
     # Determine colors by team
-    if home_player_ids is not None and away_player_ids is not None:
-        colors = []
-        for pid in frame_df["player_id"]:
-            if pid in home_player_ids:
-                colors.append("blue")
-            elif pid in away_player_ids:
-                colors.append("red")
-            else:
-                colors.append("gray")
-    else:
-        colors = "blue"
+    colors = _team_colors(frame_df["player_id"], home_player_ids, away_player_ids)
 
     # Plot players
     ax.scatter(
@@ -158,11 +208,14 @@ def plot_players(
 
     # Optional player IDs
     if show_ids:
-        for _, player in frame_df.iterrows():
+        labels = frame_df["player_id"].astype(str).str[-4:]
+        for x, y, label in zip(
+            frame_df["x"].to_numpy(), frame_df["y"].to_numpy(), labels.to_numpy()
+        ):
             ax.text(
-                player["x"],
-                player["y"],
-                str(player["player_id"])[-4:],
+                x,
+                y,
+                label,
                 ha="center",
                 va="center",
                 fontsize=6,
@@ -172,7 +225,7 @@ def plot_players(
 
     # Plot ball
     if show_ball and ball_df is not None:
-        ball_frame = ball_df[ball_df["frame"] == frame_number]
+        ball_frame = _frame_slice(ball_df, frame_number)
         if len(ball_frame) > 0:
             ax.scatter(
                 ball_frame["x"].iloc[0],
@@ -189,42 +242,89 @@ def plot_players(
     return ax
 
 
-def plot_voronoi(ax, df, frame_number, alpha=0.3):
+def plot_voronoi(ax, df, frame_number, alpha=0.3, pitch_length=105, pitch_width=68):
     """
     Overlay Voronoi diagram on pitch.
 
+    Cells are clipped to the pitch, matching the areas used in space_analysis.
+
     Args:
         ax: Matplotlib axis
-        df (pd.DataFrame): Tracking data
+        df (pd.DataFrame or FrameIndex): Tracking data
         frame_number (int): Frame to plot
         alpha (float): Region transparency
+        pitch_length (float): Pitch length in meters (default: 105)
+        pitch_width (float): Pitch width in meters (default: 68)
 
     Returns:
         matplotlib.axes.Axes: Updated axis
     """
-    from scipy.spatial import Voronoi
+    from src.space_analysis import pitch_voronoi_cells
 
-    frame_df = df[df["frame"] == frame_number]
+    frame_df = _frame_slice(df, frame_number)
 
     if len(frame_df) < 4:
         return ax
 
-    points = frame_df[["x", "y"]].values
+    points = frame_df[["x", "y"]].values.astype(np.float64)
 
     try:
-        vor = Voronoi(points)
+        vertices, regions = pitch_voronoi_cells(points, pitch_length, pitch_width)
     except:
         return ax
 
-    # Draw regions
-    for region in vor.regions:
-        if -1 not in region and len(region) > 0:
-            polygon = [vor.vertices[i] for i in region]
-            ax.fill(*zip(*polygon), alpha=alpha, edgecolor="black", linewidth=0.5)
+    # Draw one cell per player as a single collection, colored through the
+    # property cycle as successive ax.fill calls would be
+    polygons = [vertices[region] for region in regions]
+    cycle_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    facecolors = [cycle_colors[i % len(cycle_colors)] for i in range(len(polygons))]
+    ax.add_collection(
+        PolyCollection(
+            polygons,
+            facecolors=facecolors,
+            edgecolors="black",
+            linewidths=0.5,
+            alpha=alpha,
+        )
+    )
 
     return ax
 
 
+def _arrow_polygons(x, y, dx, dy, head_width, head_length, width=0.001):
+    """
+    Outlines of many `ax.arrow` arrows at once.
+
+    Same geometry as matplotlib's FancyArrow (full shape, head added beyond
+    the end point), so the arrows can be drawn as a single collection.
+
+    Returns:
+        np.array: (n, 8, 2) polygon vertices
+    """
+    distance = np.hypot(dx, dy)
+    hl, hw, lw = head_length, head_width / 2, width / 2
+
+    # Arrow along +x with its tip at (0, 0), tail at -(distance + head)
+    u = np.zeros((len(distance), 8))
+    u[:, [1, 2, 5, 6]] = -hl
+    u[:, 3] = u[:, 4] = -hl - distance
+    v = np.broadcast_to([0.0, -hw, -lw, -lw, lw, lw, hw, 0.0], u.shape)
+
+    # Rotate onto (dx, dy) and move the tip past the end point
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos = np.where(distance != 0, dx / distance, 0.0)
+        sin = np.where(distance != 0, dy / distance, 1.0)
+    tip_x = x + dx + hl * cos
+    tip_y = y + dy + hl * sin
+    return np.stack(
+        [
+            u * cos[:, None] - v * sin[:, None] + tip_x[:, None],
+            u * sin[:, None] + v * cos[:, None] + tip_y[:, None],
+        ],
+        axis=-1,
+    )
+
+
 def plot_run_trajectories(
     ax,
     trajectories_df,
@@ -250,65 +350,303 @@ def plot_run_trajectories(
     if len(trajectories_df) == 0:
         return ax
 
-    df = trajectories_df.copy()
+    df = trajectories_df
 
     # Filter to top percentile if specified
     if top_percentile is not None:
         threshold = df["total_space_created"].quantile(1 - top_percentile)
         df = df[df["total_space_created"] >= threshold]
 
-    # Calculate arrow components
-    df["dx"] = df["end_x"] - df["start_x"]
-    df["dy"] = df["end_y"] - df["start_y"]
-
-    # Plot trajectories
-    for idx, row in df.iterrows():
-        # Determine color
-        if velocity_colormap and "max_velocity" in df.columns:
-            # Normalize velocity to 0-1 range for colormap
-            vel_normalized = (row["max_velocity"] - 5.0) / (
-                12.0 - 5.0
-            )  # 5-12 m/s range
-            vel_normalized = np.clip(vel_normalized, 0, 1)
-            arrow_color = plt.cm.Reds(vel_normalized)
-        else:
-            arrow_color = color
-
-        # Draw arrow
-        ax.arrow(
-            row["start_x"],
-            row["start_y"],
-            row["dx"],
-            row["dy"],
+    # Arrow components as arrays, leaving the caller's DataFrame untouched
+    start_x = df["start_x"].to_numpy()
+    start_y = df["start_y"].to_numpy()
+    dx = df["end_x"].to_numpy() - start_x
+    dy = df["end_y"].to_numpy() - start_y
+
+    # Determine colors
+    if velocity_colormap and "max_velocity" in df.columns:
+        # Normalize velocity to 0-1 range for colormap (5-12 m/s range)
+        vel_normalized = (df["max_velocity"].to_numpy() - 5.0) / (12.0 - 5.0)
+        arrow_colors = plt.cm.Reds(np.clip(vel_normalized, 0, 1))
+    else:
+        arrow_colors = color
+
+    # Draw all arrows as one collection
+    arrows = PolyCollection(
+        _arrow_polygons(
+            start_x,
+            start_y,
+            dx,
+            dy,
             head_width=2.5,
             head_length=2.0,
-            fc=arrow_color,
-            ec="black",
-            alpha=alpha,
-            linewidth=1.5,
-            zorder=5,
+        ),
+        facecolors=arrow_colors,
+        edgecolors="black",
+        alpha=alpha,
+        linewidths=1.5,
+        zorder=5,
+        rasterized=True,
+    )
+    ax.add_collection(arrows)
+
+    # Mark start (green) and end (red)
+    ax.scatter(
+        start_x,
+        start_y,
+        c="green",
+        s=80,
+        edgecolors="black",
+        linewidths=1.5,
+        zorder=10,
+        alpha=0.8,
+        rasterized=True,
+    )
+    ax.scatter(
+        df["end_x"],
+        df["end_y"],
+        c="red",
+        s=80,
+        edgecolors="black",
+        linewidths=1.5,
+        zorder=10,
+        alpha=0.8,
+        rasterized=True,
+    )
+
+    return ax
+
+
+def animate_frames(
+    df,
+    frame_numbers,
+    home_player_ids=None,
+    away_player_ids=None,
+    ball_df=None,
+    show_voronoi=False,
+    interval=100,
+    pitch_length=105,
+    pitch_width=68,
+):
+    """
+    Animate player (and optionally ball and Voronoi) positions over frames.
+
+    One figure is reused for the whole animation: the pitch is drawn once and
+    the player, ball and Voronoi artists are updated in place, so with
+    blitting only they are redrawn between frames.
+
+    Args:
+        df (pd.DataFrame): Tracking data
+        frame_numbers (list): Frames to animate, in order
+        home_player_ids (list, optional): Home team player IDs (colored blue)
+        away_player_ids (list, optional): Away team player IDs (colored red)
+        ball_df (pd.DataFrame, optional): Ball tracking data
+        show_voronoi (bool): Overlay pitch-clipped Voronoi cells
+        interval (int): Delay between frames in ms (default: 100 = 10 fps)
+        pitch_length (float): Pitch length in meters (default: 105)
+        pitch_width (float): Pitch width in meters (default: 68)
+
+    Returns:
+        matplotlib.animation.FuncAnimation: Call .save(...) or display it
+    """
+    from matplotlib.animation import FuncAnimation
+    from scipy.spatial import QhullError
+    from src.space_analysis import pitch_voronoi_cells
+
+    # Index the frames once for the whole animation
+    if not isinstance(df, FrameIndex):
+        df = FrameIndex(df)
+    if ball_df is not None and not isinstance(ball_df, FrameIndex):
+        ball_df = FrameIndex(ball_df)
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    draw_pitch(ax, pitch_length, pitch_width)
+
+    cells = PolyCollection(
+        [], edgecolors="black", linewidths=0.5, alpha=0.3, animated=True
+    )
+    ax.add_collection(cells)
+    players = ax.scatter(
+        np.empty(0),
+        np.empty(0),
+        s=200,
+        alpha=0.7,
+        edgecolors="black",
+        linewidths=1.5,
+        zorder=10,
+        animated=True,
+    )
+    ball = ax.scatter(
+        np.empty(0),
+        np.empty(0),
+        c="white",
+        s=100,
+        edgecolors="black",
+        linewidths=2,
+        marker="o",
+        zorder=15,
+        animated=True,
+    )
+    cycle_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+
+    def update(frame_number):
+        frame_df = _frame_slice(df, frame_number)
+        points = frame_df[["x", "y"]].to_numpy(dtype=np.float64)
+
+        players.set_offsets(points)
+        players.set_facecolors(
+            _team_colors(frame_df["player_id"], home_player_ids, away_player_ids)
         )
+        artists = [players]
+
+        if ball_df is not None:
+            ball_frame = _frame_slice(ball_df, frame_number)
+            ball.set_offsets(ball_frame[["x", "y"]].to_numpy()[:1])
+            artists.append(ball)
+
+        if show_voronoi:
+            polygons = []
+            if len(points) >= 4:
+                try:
+                    vertices, regions = pitch_voronoi_cells(
+                        points, pitch_length, pitch_width
+                    )
+                    polygons = [vertices[region] for region in regions]
+                except QhullError:
+                    # Degenerate frame (e.g. collinear players): no cells
+                    pass
+            cells.set_verts(polygons)
+            cells.set_facecolors(
+                [cycle_colors[i % len(cycle_colors)] for i in range(len(polygons))]
+            )
+            artists.append(cells)
 
-        # Mark start (green) and end (red)
-        ax.scatter(
-            row["start_x"],
-            row["start_y"],
-            c="green",
-            s=80,
-            edgecolors="black",
-            linewidths=1.5,
-            zorder=10,
-            alpha=0.8,
+        return artists
+
+    return FuncAnimation(
+        fig, update, frames=list(frame_numbers), interval=interval, blit=True
+    )
+
+
+def _render_frame(
+    frame,
+    out_dir,
+    home_player_ids,
+    away_player_ids,
+    show_voronoi,
+    dpi,
+    pitch_length=105,
+    pitch_width=68,
+):
+    """Render one (frame_number, frame_df, ball_frame_df) tuple to a PNG."""
+    frame_number, frame_df, ball_frame_df = frame
+
+    # Plain Agg figure: no pyplot figure manager to register or close
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    draw_pitch(ax, pitch_length, pitch_width)
+    if show_voronoi:
+        plot_voronoi(
+            ax,
+            frame_df,
+            frame_number,
+            pitch_length=pitch_length,
+            pitch_width=pitch_width,
         )
-        ax.scatter(
-            row["end_x"],
-            row["end_y"],
-            c="red",
-            s=80,
-            edgecolors="black",
-            linewidths=1.5,
-            zorder=10,
-            alpha=0.8,
+    plot_players(
+        ax,
+        frame_df,
+        frame_number,
+        home_player_ids,
+        away_player_ids,
+        show_ball=ball_frame_df is not None,
+        ball_df=ball_frame_df,
+    )
+
+    path = Path(out_dir) / f"frame_{frame_number:06d}.png"
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def render_frames(
+    df,
+    frame_numbers,
+    out_dir,
+    home_player_ids=None,
+    away_player_ids=None,
+    ball_df=None,
+    show_voronoi=True,
+    dpi=100,
+    max_workers=1,
+    pitch_length=105,
+    pitch_width=68,
+):
+    """
+    Render many frames (players, optional Voronoi and ball) to PNG files.
+
+    With several workers, frames are rendered in parallel processes; each
+    worker only receives the rows of its own frame, and frames are sliced
+    only as workers free up, so the export is never held in memory at once.
+
+    Args:
+        df (pd.DataFrame): Tracking data
+        frame_numbers (list): Frames to render
+        out_dir (str or Path): Output directory (created if missing)
+        home_player_ids (list, optional): Home team player IDs (colored blue)
+        away_player_ids (list, optional): Away team player IDs (colored red)
+        ball_df (pd.DataFrame, optional): Ball tracking data
+        show_voronoi (bool): Overlay Voronoi cells (default: True)
+        dpi (int): Output resolution (default: 100)
+        max_workers (int, optional): Parallel processes (default: 1, render in
+            this process; None: one per CPU core). With more than one worker,
+            scripts must call this under `if __name__ == "__main__":`
+        pitch_length (float): Pitch length in meters (default: 105)
+        pitch_width (float): Pitch width in meters (default: 68)
+
+    Returns:
+        list: Paths of the written images, in frame order
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if not isinstance(df, FrameIndex):
+        df = FrameIndex(df)
+    if ball_df is not None and not isinstance(ball_df, FrameIndex):
+        ball_df = FrameIndex(ball_df)
+
+    frames = (
+        (
+            frame_number,
+            _frame_slice(df, frame_number),
+            _frame_slice(ball_df, frame_number) if ball_df is not None else None,
         )
+        for frame_number in frame_numbers
+    )
 
-    return ax
+    render = partial(
+        _render_frame,
+        out_dir=out_dir,
+        home_player_ids=home_player_ids,
+        away_player_ids=away_player_ids,
+        show_voronoi=show_voronoi,
+        dpi=dpi,
+        pitch_length=pitch_length,
+        pitch_width=pitch_width,
+    )
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        return [render(frame) for frame in frames]
+
+    # Executor.map would slice and submit every frame up front; keep only a
+    # couple of frames per worker in flight instead
+    paths = []
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for frame in frames:
+            pending.append(executor.submit(render, frame))
+            if len(pending) >= 2 * max_workers:
+                paths.append(pending.popleft().result())
+        paths.extend(future.result() for future in pending)
+    return paths